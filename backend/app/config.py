@@ -0,0 +1,41 @@
+import secrets
+from functools import lru_cache
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="VEREIN_")
+
+    environment: str = "development"
+    database_url: str = "sqlite:///./app.db"
+    init_lock_path: str = "./app.db.init.lock"
+    metrics_enabled: bool = True
+    slow_query_ms: float = 200.0
+    fast_json: bool = False
+    tenancy_enabled: bool = False
+    tenant_header: str = "X-Club"
+    tenant_base_domain: str | None = None
+    tenant_database_dir: str = "./clubs"
+    tenant_max_engines: int = 128
+    cluster_nodes: str = ""
+    node_id: str = ""
+    group_commit_enabled: bool = False
+    group_commit_max_batch: int = 64
+    group_commit_window_ms: float = 0.0
+    # Signs pagination cursors; set it explicitly when several workers serve the same clients.
+    cursor_secret: str = Field(default_factory=lambda: secrets.token_urlsafe(32))
+
+    @property
+    def seed_on_startup(self) -> bool:
+        return self.environment != "production"
+
+    @property
+    def cluster_node_list(self) -> list[str]:
+        return [node.strip() for node in self.cluster_nodes.split(",") if node.strip()]
+
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
@@ -1,14 +1,28 @@
-from sqlmodel import Session, SQLModel, create_engine
+from fastapi import Depends, Request
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, create_engine
 
-DATABASE_URL = "sqlite:///./app.db"
+from . import search, sync  # noqa: F401  register schema and flush hooks
+from .config import get_settings
+from .metrics import instrument_engine
+from .tenancy import tenant_engine
+
+DATABASE_URL = get_settings().database_url
 
 engine = create_engine(DATABASE_URL, echo=False, connect_args={"check_same_thread": False})
+instrument_engine(engine)
+
+
+def get_default_engine() -> Engine:
+    return engine
 
 
-def init_db() -> None:
-    SQLModel.metadata.create_all(engine)
+def get_engine(request: Request, default: Engine = Depends(get_default_engine)) -> Engine:
+    if get_settings().tenancy_enabled:
+        return tenant_engine(request)
+    return default
 
 
-def get_session() -> Session:
-    with Session(engine) as session:
+def get_session(bind: Engine = Depends(get_engine)) -> Session:
+    with Session(bind) as session:
         yield session
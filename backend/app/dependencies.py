@@ -7,7 +7,7 @@ from .models import RoleEnum, User
 
 def get_current_user(
     session: Session = Depends(get_session),
-    x_user_id: int | None = Header(default=None, convert_underscores=False),
+    x_user_id: int | None = Header(default=None, alias="X-User-Id"),
 ) -> User:
     if x_user_id is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="X-User-Id header required")
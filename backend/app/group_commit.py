@@ -0,0 +1,175 @@
+import contextvars
+import queue
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from .config import get_settings
+
+IDLE_SECONDS = 30.0
+_STOP = object()
+
+Work = Callable[[Session], Any]
+Item = tuple[Work, Future, contextvars.Context]
+
+
+class GroupCommitter:
+    """Single writer that applies queued writes in one transaction per batch.
+
+    Each piece of work runs inside its own SAVEPOINT, so a failing request is
+    rolled back alone while the rest of the batch commits. Callers block until
+    the batch containing their work has been committed (i.e. is durable).
+    Work runs in a copy of the caller's context, so per-request SQL metrics
+    still count the statements it issues.
+    """
+
+    def __init__(self, engine: Engine, max_batch: int, window_ms: float) -> None:
+        # Weak, so a committer never keeps an evicted club engine alive.
+        self._engine = weakref.ref(engine)
+        self.max_batch = max_batch
+        self.window = window_ms / 1000
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    @property
+    def engine(self) -> Engine | None:
+        return self._engine()
+
+    def submit(self, work: Work) -> Any:
+        future: Future = Future()
+        with self._lock:
+            self._queue.put((work, future, contextvars.copy_context()))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+                self._thread.start()
+        return future.result()
+
+    def close(self) -> None:
+        """Stop the writer once the queued work has been applied."""
+        with self._lock:
+            self._closed = True
+            if self._thread is not None:
+                self._queue.put(_STOP)
+
+    def _collect(self) -> list[Item] | None:
+        try:
+            item = self._queue.get(timeout=IDLE_SECONDS)
+        except queue.Empty:
+            return None
+        if item is _STOP:
+            return None
+        batch = [item]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            try:
+                # Drain whatever queued up while the previous batch was committing,
+                # then optionally linger for the configured window.
+                remaining = deadline - time.monotonic()
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self) -> None:
+        try:
+            while True:
+                batch = self._collect()
+                if batch is not None:
+                    self._apply(batch)
+                with self._lock:
+                    if self._queue.empty() and (batch is None or self._closed):
+                        return
+        finally:
+            # Also reached if the writer dies, so the next submit() starts a fresh one.
+            with self._lock:
+                self._thread = None
+                if not self._queue.empty() and not self._closed:
+                    self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+                    self._thread.start()
+
+    def _apply(self, batch: list[Item]) -> None:
+        outcomes: list[tuple[Future, Any, BaseException | None]] = []
+        try:
+            engine = self.engine
+            if engine is None:
+                raise RuntimeError("Database engine was disposed")
+            with Session(engine, expire_on_commit=False) as session:
+                connection = session.connection()
+                if connection.dialect.name == "sqlite":
+                    # pysqlite defers BEGIN until the first DML statement, which would
+                    # let the first SAVEPOINT open (and its RELEASE commit) the transaction.
+                    connection.exec_driver_sql("BEGIN IMMEDIATE")
+                for work, future, context in batch:
+                    savepoint = session.begin_nested()
+                    try:
+                        result = context.run(_execute, session, work)
+                        savepoint.commit()
+                    except Exception as exc:
+                        savepoint.rollback()
+                        outcomes.append((future, None, exc))
+                    else:
+                        outcomes.append((future, result, None))
+                session.commit()
+        except BaseException as exc:
+            # BaseException too: work raising e.g. SystemExit must not leave callers blocked forever.
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for future, result, exc in outcomes:
+            if exc is not None:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+
+def _execute(session: Session, work: Work) -> Any:
+    result = work(session)
+    session.flush()
+    if result is not None:
+        # Same as the direct path's refresh: hand back the stored row, not the request body.
+        session.refresh(result)
+    return result
+
+
+_committers: "weakref.WeakKeyDictionary[Engine, GroupCommitter]" = weakref.WeakKeyDictionary()
+_committers_lock = threading.Lock()
+
+
+def committer_for(engine: Engine) -> GroupCommitter:
+    with _committers_lock:
+        committer = _committers.get(engine)
+        if committer is None:
+            settings = get_settings()
+            committer = GroupCommitter(engine, settings.group_commit_max_batch, settings.group_commit_window_ms)
+            _committers[engine] = committer
+        return committer
+
+
+def discard_committer(engine: Engine) -> None:
+    """Drop the engine's committer (e.g. on tenant eviction) and stop its writer thread."""
+    with _committers_lock:
+        committer = _committers.pop(engine, None)
+    if committer is not None:
+        committer.close()
+
+
+def run_write(session: Session, work: Work) -> Any:
+    """Apply `work` and commit, coalesced with concurrent writes when group commit is on."""
+    if get_settings().group_commit_enabled:
+        return committer_for(session.get_bind()).submit(work)
+    result = work(session)
+    session.commit()
+    session.refresh(result)
+    return result
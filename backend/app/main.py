@@ -1,23 +1,29 @@
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from sqlmodel import Session
 
-from .database import engine, init_db
-from .routers import drinks, events, fines, ledger, lineups, subscriptions, ticker, users
-from .seed import seed
+from .config import get_settings
+from .database import engine
+from .metrics import MetricsMiddleware
+from .routers import drinks, events, fines, health, ledger, lineups, metrics, subscriptions, sync, ticker, users
+from .startup import initialize
+from .tenancy import registry
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    init_db()
-    with Session(engine) as session:
-        seed(session)
+    app.state.ready = False
+    if not get_settings().tenancy_enabled:
+        initialize(engine)
+    app.state.ready = True
     yield
+    app.state.ready = False
+    registry.clear()
 
 
 def create_app() -> FastAPI:
     app = FastAPI(title="Vereins-App API", lifespan=lifespan)
+    app.include_router(health.router)
     app.include_router(users.router)
     app.include_router(events.router)
     app.include_router(drinks.router)
@@ -26,7 +32,22 @@ def create_app() -> FastAPI:
     app.include_router(lineups.router)
     app.include_router(ticker.router)
     app.include_router(subscriptions.router)
+    app.include_router(sync.router)
+    if get_settings().metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics.router)
     return app
 
 
-app = create_app()
+_app: FastAPI | None = None
+
+
+def __getattr__(name: str) -> FastAPI:
+    # `uvicorn backend.app.main:app` keeps working, but importing this module
+    # (tests, benchmarks, `--factory` runs) no longer builds an app as a side effect.
+    global _app
+    if name != "app":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if _app is None:
+        _app = create_app()
+    return _app
@@ -0,0 +1,275 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNMATCHED_ROUTE = "<unmatched>"
+BACKGROUND_ROUTE = "<background>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SQL_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SQL_SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[Any, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def get(self, labels: tuple = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, labels)} {value}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self) -> None:
+        with self._lock:
+            self.value += 1
+
+    def dec(self) -> None:
+        with self._lock:
+            self.value -= 1
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge", f"{self.name} {self.value}"]
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...], labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.labels = labels
+        # labels -> [per-bucket counts (last slot is +Inf), sum, count]
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, labels: tuple) -> int:
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def total(self, labels: tuple) -> float:
+        series = self._series.get(labels)
+        return series[1] if series else 0.0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        bounds = [str(bucket) for bucket in self.buckets] + ["+Inf"]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(bounds, counts):
+                    cumulative += bucket_count
+                    label_str = _format_labels(self.labels + ("le",), labels + (bound,))
+                    lines.append(f"{self.name}_bucket{label_str} {cumulative}")
+                label_str = _format_labels(self.labels, labels)
+                lines.append(f"{self.name}_sum{label_str} {total}")
+                lines.append(f"{self.name}_count{label_str} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.request_latency = Histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency by route and method.",
+            LATENCY_BUCKETS,
+            ("method", "route"),
+        )
+        self.requests_total = Counter(
+            "http_requests_total", "HTTP requests by route, method and status.", ("method", "route", "status")
+        )
+        self.in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+        self.sql_statements = Histogram(
+            "db_statements_per_request",
+            "SQL statements executed per HTTP request.",
+            SQL_COUNT_BUCKETS,
+            ("method", "route"),
+        )
+        self.sql_seconds = Histogram(
+            "db_statement_seconds_per_request",
+            "Total SQL execution time per HTTP request.",
+            SQL_SECONDS_BUCKETS,
+            ("method", "route"),
+        )
+        self.slow_queries = Counter("db_slow_queries_total", "SQL statements above the slow-query threshold.", ("route",))
+        self._engines: dict[str, Engine] = {}
+
+    def register_engine(self, name: str, engine: Engine) -> None:
+        self._engines[name] = engine
+
+    def unregister_engine(self, name: str) -> None:
+        self._engines.pop(name, None)
+
+    def observe_request(self, method: str, route: str, status_code: int, elapsed: float, stats: "RequestStats") -> None:
+        self.request_latency.observe((method, route), elapsed)
+        self.requests_total.inc((method, route, status_code))
+        self.sql_statements.observe((method, route), stats.statements)
+        self.sql_seconds.observe((method, route), stats.sql_seconds)
+
+    def _render_pools(self) -> list[str]:
+        gauges = (
+            ("db_pool_size", "size", "Configured connection pool size."),
+            ("db_pool_checked_out", "checkedout", "Connections currently checked out of the pool."),
+            ("db_pool_checked_in", "checkedin", "Idle connections held by the pool."),
+            ("db_pool_overflow", "overflow", "Connections opened beyond the pool size."),
+        )
+        lines: list[str] = []
+        engines = sorted(self._engines.items())
+        for metric, attribute, help_text in gauges:
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+            for name, engine in engines:
+                reader = getattr(engine.pool, attribute, None)
+                if reader is not None:
+                    lines.append(f"{metric}{_format_labels(('engine',), (name,))} {reader()}")
+        return lines
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in (
+            self.request_latency,
+            self.requests_total,
+            self.in_flight,
+            self.sql_statements,
+            self.sql_seconds,
+            self.slow_queries,
+        ):
+            lines += metric.render()
+        lines += self._render_pools()
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+@dataclass
+class RequestStats:
+    scope: dict = field(repr=False)
+    statements: int = 0
+    sql_seconds: float = 0.0
+
+    @property
+    def route(self) -> str:
+        return route_label(self.scope)
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def route_label(scope: dict) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    # On the execution context rather than the connection: a failing statement
+    # never reaches after_cursor_execute and must not leave a timer behind.
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - context._metrics_started
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.sql_seconds += elapsed
+    if elapsed * 1000 >= get_settings().slow_query_ms:
+        route = stats.route if stats is not None else BACKGROUND_ROUTE
+        metrics.slow_queries.inc((route,))
+        logger.warning("Slow query (%.1f ms) on %s: %s", elapsed * 1000, route, statement)
+
+
+def listen_for_queries(engine: Engine) -> None:
+    """Count and time statements per request without exporting the engine's pool."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def instrument_engine(engine: Engine, name: str = "default") -> None:
+    listen_for_queries(engine)
+    metrics.register_engine(name, engine)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency and per-request SQL usage."""
+
+    def __init__(self, app, registry: MetricsRegistry = metrics) -> None:
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _request_stats.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self.registry.in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.registry.in_flight.dec()
+            _request_stats.reset(token)
+            self.registry.observe_request(scope["method"], stats.route, status_code, elapsed, stats)
@@ -5,6 +5,7 @@ from enum import Enum
 from typing import Optional
 
 from pydantic import EmailStr
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -56,6 +57,7 @@ class User(SQLModel, table=True):
     role: RoleEnum = Field(default=RoleEnum.player, index=True)
     balance_cents: int = 0
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    revision: int = Field(default=0, index=True)
 
 
 class Event(SQLModel, table=True):
@@ -68,6 +70,7 @@ class Event(SQLModel, table=True):
     requires_response: bool = False
     notes_allowed: bool = True
     created_by: Optional[int] = Field(default=None, foreign_key="user.id")
+    revision: int = Field(default=0, index=True)
 
 
 class EventResponse(SQLModel, table=True):
@@ -77,6 +80,7 @@ class EventResponse(SQLModel, table=True):
     response: ResponseStatus
     note: Optional[str] = None
     responded_at: datetime = Field(default_factory=datetime.utcnow)
+    revision: int = Field(default=0, index=True)
 
 
 class Drink(SQLModel, table=True):
@@ -84,6 +88,7 @@ class Drink(SQLModel, table=True):
     name: str
     price_cents: int = 0
     stock: int = 0
+    revision: int = Field(default=0, index=True)
 
 
 class DrinkOrder(SQLModel, table=True):
@@ -97,6 +102,8 @@ class DrinkOrder(SQLModel, table=True):
 
 
 class LedgerEntry(SQLModel, table=True):
+    __table_args__ = (Index("ix_ledgerentry_user_statement", "user_id", "created_at", "id"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: Optional[int] = Field(default=None, foreign_key="user.id")
     amount_cents: int
@@ -104,6 +111,7 @@ class LedgerEntry(SQLModel, table=True):
     category: str
     description: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    revision: int = Field(default=0, index=True)
 
 
 class Fine(SQLModel, table=True):
@@ -171,3 +179,21 @@ class ClubSettings(SQLModel, table=True):
     allow_notes_on_responses: bool = True
     dues_interval: SubscriptionInterval = Field(default=SubscriptionInterval.monthly)
     dues_amount_cents: int = 0
+
+
+class SchemaVersion(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    fingerprint: str
+    applied_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class SyncCounter(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    value: int = 0
+
+
+class Tombstone(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    entity: str = Field(index=True)
+    row_id: int
+    revision: int = Field(index=True)
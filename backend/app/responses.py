@@ -0,0 +1,54 @@
+from typing import Any
+
+from fastapi import HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select as sa_select
+from sqlmodel import Session, SQLModel
+
+from .config import get_settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional extra
+    orjson = None
+
+
+def use_fast_path(fields: str | None) -> bool:
+    return fields is not None or get_settings().fast_json
+
+
+def fast_json_response(content: Any, status_code: int = status.HTTP_200_OK) -> Response:
+    """Encode plain rows directly, bypassing response_model re-validation."""
+    if orjson is not None:
+        return Response(orjson.dumps(content), status_code=status_code, media_type="application/json")
+    return JSONResponse(jsonable_encoder(content), status_code=status_code)
+
+
+def projected_columns(model: type[SQLModel], fields: str | None) -> list:
+    columns = model.__table__.columns
+    if not fields:
+        return list(columns)
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in columns]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown fields: {', '.join(unknown) or fields}"
+        )
+    return [columns[name] for name in names]
+
+
+def projected_responses(model: type[SQLModel]) -> dict:
+    """OpenAPI note for list endpoints whose rows `fields` can narrow."""
+    description = (
+        f"List of {model.__name__} rows. With `fields`, each row contains only the requested "
+        "columns and is returned without response-model validation."
+    )
+    return {status.HTTP_200_OK: {"description": description}}
+
+
+def projected_list(session: Session, model: type[SQLModel], fields: str | None, *order_by) -> Response:
+    """SELECT only the requested columns and return them without building ORM objects."""
+    stmt = sa_select(*projected_columns(model, fields)).order_by(*order_by)
+    rows = session.execute(stmt).mappings()
+    return fast_json_response([dict(row) for row in rows])
@@ -1,15 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlmodel import Session, select
 
 from ..database import get_session
 from ..dependencies import get_current_user, require_role
+from ..group_commit import run_write
 from ..models import Drink, DrinkOrder, DrinkOrderMode, RoleEnum, User
+from ..responses import projected_list, projected_responses, use_fast_path
 
 router = APIRouter(prefix="/drinks", tags=["drinks"])
 
 
-@router.get("", response_model=list[Drink])
-def list_drinks(session: Session = Depends(get_session)) -> list[Drink]:
+@router.get("", response_model=list[Drink], responses=projected_responses(Drink))
+def list_drinks(
+    fields: str | None = Query(default=None, description="Comma-separated columns to return"),
+    session: Session = Depends(get_session),
+) -> list[Drink] | Response:
+    if use_fast_path(fields):
+        return projected_list(session, Drink, fields)
     return session.exec(select(Drink)).all()
 
 
@@ -34,19 +41,22 @@ def book_drink(
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ) -> DrinkOrder:
-    drink = session.get(Drink, drink_id)
-    if not drink:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Drink not found")
-    if drink.stock < quantity:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Not enough stock")
-
-    drink.stock -= quantity
-    order = DrinkOrder(drink_id=drink_id, user_id=current_user.id, quantity=quantity, mode=mode, event_id=event_id)
-    session.add(order)
-    session.add(drink)
-    session.commit()
-    session.refresh(order)
-    return order
+    user_id = current_user.id
+
+    def book(db: Session) -> DrinkOrder:
+        drink = db.get(Drink, drink_id)
+        if not drink:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Drink not found")
+        if drink.stock < quantity:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Not enough stock")
+
+        drink.stock -= quantity
+        order = DrinkOrder(drink_id=drink_id, user_id=user_id, quantity=quantity, mode=mode, event_id=event_id)
+        db.add(order)
+        db.add(drink)
+        return order
+
+    return run_write(session, book)
 
 
 @router.get("/stats", response_model=dict)
@@ -1,15 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlmodel import Session, select
 
 from ..database import get_session
 from ..dependencies import get_current_user, require_role
+from ..group_commit import run_write
 from ..models import Event, EventResponse, EventType, ResponseStatus, RoleEnum, User
+from ..responses import projected_list, projected_responses, use_fast_path
 
 router = APIRouter(prefix="/events", tags=["events"])
 
 
-@router.get("", response_model=list[Event])
-def list_events(session: Session = Depends(get_session)) -> list[Event]:
+@router.get("", response_model=list[Event], responses=projected_responses(Event))
+def list_events(
+    fields: str | None = Query(default=None, description="Comma-separated columns to return"),
+    session: Session = Depends(get_session),
+) -> list[Event] | Response:
+    if use_fast_path(fields):
+        return projected_list(session, Event, fields)
     return session.exec(select(Event)).all()
 
 
@@ -34,26 +41,27 @@ def respond_to_event(
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ) -> EventResponse:
-    event = session.get(Event, event_id)
-    if not event:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+    user_id = current_user.id
 
-    existing = session.exec(
-        select(EventResponse).where(EventResponse.event_id == event_id, EventResponse.user_id == current_user.id)
-    ).first()
-    if existing:
-        existing.response = response
-        existing.note = note
-        session.add(existing)
-        session.commit()
-        session.refresh(existing)
-        return existing
+    def respond(db: Session) -> EventResponse:
+        event = db.get(Event, event_id)
+        if not event:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
 
-    event_response = EventResponse(event_id=event_id, user_id=current_user.id, response=response, note=note)
-    session.add(event_response)
-    session.commit()
-    session.refresh(event_response)
-    return event_response
+        existing = db.exec(
+            select(EventResponse).where(EventResponse.event_id == event_id, EventResponse.user_id == user_id)
+        ).first()
+        if existing:
+            existing.response = response
+            existing.note = note
+            db.add(existing)
+            return existing
+
+        event_response = EventResponse(event_id=event_id, user_id=user_id, response=response, note=note)
+        db.add(event_response)
+        return event_response
+
+    return run_write(session, respond)
 
 
 @router.get("/{event_id}/responses", response_model=list[EventResponse])
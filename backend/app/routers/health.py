@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from ..config import get_settings
+from ..database import get_default_engine
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live", response_model=dict)
+def liveness() -> dict:
+    return {"status": "ok"}
+
+
+@router.get("/ready", response_model=dict)
+def readiness(request: Request, engine: Engine = Depends(get_default_engine)) -> dict:
+    if not getattr(request.app.state, "ready", False):
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Startup not complete")
+    # Deliberately tenant-independent: probes must not need a club header. With
+    # tenancy on the default database is unused, and connecting would create it.
+    if not get_settings().tenancy_enabled:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    return {"status": "ready"}
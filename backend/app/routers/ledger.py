@@ -1,9 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import case, func, tuple_
 from sqlmodel import Session, select
 
+from ..config import get_settings
 from ..database import get_session
 from ..dependencies import ensure_user_exists, require_role
+from ..group_commit import run_write
 from ..models import LedgerEntry, LedgerEntryType, RoleEnum, User
+from ..responses import projected_list, projected_responses, use_fast_path
 
 router = APIRouter(prefix="/ledger", tags=["ledger"])
 
@@ -21,8 +32,13 @@ def _apply_balance(session: Session, entry: LedgerEntry) -> None:
     session.add(user)
 
 
-@router.get("", response_model=list[LedgerEntry])
-def list_entries(session: Session = Depends(get_session)) -> list[LedgerEntry]:
+@router.get("", response_model=list[LedgerEntry], responses=projected_responses(LedgerEntry))
+def list_entries(
+    fields: str | None = Query(default=None, description="Comma-separated columns to return"),
+    session: Session = Depends(get_session),
+) -> list[LedgerEntry] | Response:
+    if use_fast_path(fields):
+        return projected_list(session, LedgerEntry, fields, LedgerEntry.created_at.desc())
     return session.exec(select(LedgerEntry).order_by(LedgerEntry.created_at.desc())).all()
 
 
@@ -32,14 +48,91 @@ def create_entry(
     session: Session = Depends(get_session),
     _: User = Depends(require_role((RoleEnum.admin, RoleEnum.treasurer))),
 ) -> LedgerEntry:
-    session.add(entry)
-    _apply_balance(session, entry)
-    session.commit()
-    session.refresh(entry)
-    return entry
+    def create(db: Session) -> LedgerEntry:
+        db.add(entry)
+        _apply_balance(db, entry)
+        return entry
+
+    return run_write(session, create)
 
 
 @router.get("/{user_id}/balance", response_model=dict)
 def balance(user_id: int, session: Session = Depends(get_session)) -> dict:
     user = ensure_user_exists(session, user_id)
     return {"user_id": user.id, "balance_cents": user.balance_cents}
+
+
+def _cursor_signature(user_id: int, payload: bytes) -> str:
+    key = get_settings().cursor_secret.encode()
+    digest = hmac.new(key, str(user_id).encode() + b":" + payload, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest[:16]).decode()
+
+
+def _encode_cursor(user_id: int, created_at: datetime, entry_id: int, opening_cents: int) -> str:
+    """Signed, since the opening balance it carries is returned as authoritative."""
+    raw = json.dumps([created_at.isoformat(), entry_id, opening_cents]).encode()
+    return base64.urlsafe_b64encode(raw).decode() + "." + _cursor_signature(user_id, raw)
+
+
+def _decode_cursor(user_id: int, cursor: str) -> tuple[datetime, int, int]:
+    try:
+        encoded, signature = cursor.split(".")
+        raw = base64.urlsafe_b64decode(encoded.encode())
+        if not hmac.compare_digest(signature, _cursor_signature(user_id, raw)):
+            raise ValueError("signature mismatch")
+        created_at, entry_id, opening_cents = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(entry_id), int(opening_cents)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+@router.get("/{user_id}/statement", response_model=dict)
+def statement(
+    user_id: int,
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = None,
+    session: Session = Depends(get_session),
+) -> dict:
+    """Newest-first entries with the balance after each one.
+
+    The first page is seeded from the stored `balance_cents`; each cursor
+    carries the opening balance of the next page (HMAC-signed per member),
+    so every page is one index range scan of `limit` rows regardless of depth.
+    """
+    user = ensure_user_exists(session, user_id)
+    filters = [LedgerEntry.user_id == user_id]
+    opening_cents = user.balance_cents
+    if cursor:
+        created_at, entry_id, opening_cents = _decode_cursor(user_id, cursor)
+        filters.append(tuple_(LedgerEntry.created_at, LedgerEntry.id) < tuple_(created_at, entry_id))
+
+    signed = case(
+        (LedgerEntry.entry_type == LedgerEntryType.debit, -LedgerEntry.amount_cents),
+        else_=LedgerEntry.amount_cents,
+    )
+    page = (
+        select(LedgerEntry, signed.label("signed_cents"))
+        .where(*filters)
+        .order_by(LedgerEntry.created_at.desc(), LedgerEntry.id.desc())
+        .limit(limit + 1)
+        .subquery()
+    )
+    newer_cents = func.sum(page.c.signed_cents).over(
+        order_by=(page.c.created_at.desc(), page.c.id.desc()), rows=(None, -1)
+    )
+    rows = session.exec(
+        select(page, (opening_cents - func.coalesce(newer_cents, 0)).label("balance_after_cents")).order_by(
+            page.c.created_at.desc(), page.c.id.desc()
+        )
+    ).all()
+
+    entries = [dict(row._mapping) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = entries[-1]
+        next_cursor = _encode_cursor(
+            user_id, last["created_at"], last["id"], last["balance_after_cents"] - last["signed_cents"]
+        )
+    for entry in entries:
+        del entry["signed_cents"]
+    return {"user_id": user.id, "balance_cents": user.balance_cents, "entries": entries, "next_cursor": next_cursor}
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..metrics import CONTENT_TYPE, metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def export_metrics() -> PlainTextResponse:
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,51 @@
+import heapq
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import select as sa_select
+from sqlmodel import Session, select
+
+from ..database import get_session
+from ..models import Tombstone
+from ..responses import fast_json_response
+from ..sync import SYNCED_ENTITIES, current_revision
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.get("", response_model=dict)
+def changes_since(
+    since: int = Query(default=0, ge=0),
+    limit: int = Query(default=500, ge=1, le=5000),
+    session: Session = Depends(get_session),
+) -> Response:
+    # Pick the page boundary from the revision indexes alone, then fetch whole
+    # revisions up to it so a multi-row write is never split across pages.
+    sources = [model.revision for model in SYNCED_ENTITIES.values()] + [Tombstone.revision]
+    candidates = heapq.merge(
+        *(
+            session.exec(select(column).where(column > since).order_by(column).limit(limit + 1)).all()
+            for column in sources
+        )
+    )
+    window = [revision for _, revision in zip(range(limit + 1), candidates)]
+    if not window:
+        return fast_json_response({"revision": max(since, current_revision(session)), "has_more": False})
+    upto = window[min(limit, len(window)) - 1]
+    has_more = any(session.exec(select(column).where(column > upto).limit(1)).first() for column in sources)
+
+    payload: dict = {"revision": upto, "has_more": has_more, "changes": {}, "deleted": {}}
+    for name, model in SYNCED_ENTITIES.items():
+        rows = session.execute(
+            sa_select(*model.__table__.columns)
+            .where(model.revision > since, model.revision <= upto)
+            .order_by(model.revision)
+        ).mappings()
+        changed = [dict(row) for row in rows]
+        if changed:
+            payload["changes"][name] = changed
+    tombstones = session.exec(
+        select(Tombstone).where(Tombstone.revision > since, Tombstone.revision <= upto).order_by(Tombstone.revision)
+    ).all()
+    for tombstone in tombstones:
+        payload["deleted"].setdefault(tombstone.entity, []).append(tombstone.row_id)
+    return fast_json_response(payload)
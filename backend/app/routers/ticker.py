@@ -5,6 +5,7 @@ from sqlmodel import Session, select
 
 from ..database import get_session
 from ..dependencies import get_current_user, require_role
+from ..group_commit import run_write
 from ..models import Event, LiveTickerEvent, RoleEnum, User
 
 router = APIRouter(prefix="/ticker", tags=["ticker"])
@@ -17,14 +18,15 @@ def add_ticker_event(
     session: Session = Depends(get_session),
     _: User = Depends(require_role((RoleEnum.admin, RoleEnum.treasurer))),
 ) -> LiveTickerEvent:
-    event = session.get(Event, event_id)
-    if not event:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
-    ticker_event.event_id = event_id
-    session.add(ticker_event)
-    session.commit()
-    session.refresh(ticker_event)
-    return ticker_event
+    def add(db: Session) -> LiveTickerEvent:
+        event = db.get(Event, event_id)
+        if not event:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+        ticker_event.event_id = event_id
+        db.add(ticker_event)
+        return ticker_event
+
+    return run_write(session, add)
 
 
 @router.get("/{event_id}", response_model=dict)
@@ -1,15 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlmodel import Session, select
 
 from ..dependencies import get_current_user, require_role
 from ..database import get_session
 from ..models import RoleEnum, User
+from ..responses import projected_list, projected_responses, use_fast_path
+from ..search import search_users
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-@router.get("", response_model=list[User])
-def list_users(session: Session = Depends(get_session)) -> list[User]:
+@router.get("", response_model=list[User], responses=projected_responses(User))
+def list_users(
+    fields: str | None = Query(default=None, description="Comma-separated columns to return"),
+    session: Session = Depends(get_session),
+) -> list[User] | Response:
+    if use_fast_path(fields):
+        return projected_list(session, User, fields)
     return session.exec(select(User)).all()
 
 
@@ -51,6 +58,15 @@ def me(current_user: User = Depends(get_current_user)) -> User:
     return current_user
 
 
+@router.get("/search", response_model=list[User])
+def search(
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=20, ge=1, le=100),
+    session: Session = Depends(get_session),
+) -> list[User]:
+    return search_users(session, q, limit)
+
+
 @router.get("/lookup/{identifier}", response_model=User)
 def lookup(identifier: str, session: Session = Depends(get_session)) -> User:
     stmt = select(User).where((User.email == identifier) | (User.player_number == identifier))
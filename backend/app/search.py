@@ -0,0 +1,162 @@
+import logging
+import weakref
+
+from sqlalchemy import case, column, event, func, literal_column, or_, table, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel, select
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+SEARCH_COLUMNS = ("display_name", "email", "player_number")
+MIN_TRIGRAM_QUERY = 3
+# Part of the schema fingerprint, so startup creates the index on databases stamped before it existed.
+SEARCH_INDEX_VERSION = "fts5-trigram-1"
+FTS_BACKEND = "fts5"
+LIKE_BACKEND = "like"
+
+# External-content FTS5 table over "user": the index stores only trigrams, the
+# rows themselves stay in "user". Triggers keep it in step with every write.
+_FTS_TABLE_DDL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS user_search USING fts5(
+        display_name, email, player_number, content='user', content_rowid='id', tokenize='trigram'
+    )
+"""
+_TRIGGER_DDL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS user_search_ai AFTER INSERT ON "user" BEGIN
+        INSERT INTO user_search(rowid, display_name, email, player_number)
+        VALUES (new.id, new.display_name, new.email, new.player_number);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS user_search_ad AFTER DELETE ON "user" BEGIN
+        INSERT INTO user_search(user_search, rowid, display_name, email, player_number)
+        VALUES ('delete', old.id, old.display_name, old.email, old.player_number);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS user_search_au AFTER UPDATE OF display_name, email, player_number ON "user" BEGIN
+        INSERT INTO user_search(user_search, rowid, display_name, email, player_number)
+        VALUES ('delete', old.id, old.display_name, old.email, old.player_number);
+        INSERT INTO user_search(rowid, display_name, email, player_number)
+        VALUES (new.id, new.display_name, new.email, new.player_number);
+    END
+    """,
+)
+
+# Which search path each engine uses; the trigram tokenizer needs SQLite >= 3.34.
+_backends: "weakref.WeakKeyDictionary[Engine, str]" = weakref.WeakKeyDictionary()
+
+
+def _index_exists(connection: Connection) -> bool:
+    query = text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'user_search'")
+    return connection.execute(query).first() is not None
+
+
+def ensure_search_index(connection: Connection) -> str:
+    """Create the FTS5 index and its triggers if missing, backfilling existing users.
+
+    Returns the active backend; without FTS5 trigram support it is the prefix LIKE path.
+    """
+    backend = LIKE_BACKEND
+    if connection.dialect.name == "sqlite":
+        exists = _index_exists(connection)
+        try:
+            connection.execute(text(_FTS_TABLE_DDL))
+        except OperationalError as exc:
+            logger.warning("FTS5 trigram index unavailable (%s); member search uses prefix matching", exc.orig)
+        else:
+            for statement in _TRIGGER_DDL:
+                connection.execute(text(statement))
+            if not exists:
+                connection.execute(text("INSERT INTO user_search(user_search) VALUES ('rebuild')"))
+            backend = FTS_BACKEND
+    _backends[connection.engine] = backend
+    return backend
+
+
+def search_backend(session: Session) -> str:
+    bind = session.get_bind()
+    backend = _backends.get(bind)
+    if backend is None:
+        # Read-only detection for engines this process did not create the schema on.
+        sqlite_index = bind.dialect.name == "sqlite" and _index_exists(session.connection())
+        backend = _backends[bind] = FTS_BACKEND if sqlite_index else LIKE_BACKEND
+    return backend
+
+
+@event.listens_for(SQLModel.metadata, "after_create")
+def _create_search_index(target, connection: Connection, **kw) -> None:
+    ensure_search_index(connection)
+
+
+def _fts_phrase(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _match_conditions(query: str):
+    """Exact, prefix and word-prefix conditions for a lower-cased query."""
+    pattern = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    columns = [getattr(User, column) for column in SEARCH_COLUMNS]
+    exact = or_(*(func.lower(column) == query for column in columns))
+    prefix = or_(*(column.ilike(pattern, escape="\\") for column in columns))
+    word_prefix = User.display_name.ilike("% " + pattern, escape="\\")
+    return exact, prefix, word_prefix
+
+
+def _tier(query: str):
+    """0 for an exact column match, 1 for a (word) prefix match, 2 for anything else."""
+    exact, prefix, word_prefix = _match_conditions(query)
+    return case((exact, 0), (or_(prefix, word_prefix), 1), else_=2)
+
+
+def _like_search(session: Session, query: str, limit: int) -> list[User]:
+    """Prefix matches ranked in SQL (exact, prefix, word prefix) so LIMIT keeps the best ones."""
+    _, prefix, word_prefix = _match_conditions(query)
+    stmt = select(User).where(or_(prefix, word_prefix)).order_by(_tier(query), User.display_name).limit(limit)
+    return list(session.exec(stmt).all())
+
+
+_search_index = table("user_search", column("rowid"), column("rank"))
+
+
+def _fts_ids(session: Session, match: str, query: str, limit: int, exclude: list[int]) -> list[int]:
+    """Index hits ordered by match tier, then bm25, so LIMIT never drops a better tier."""
+    stmt = (
+        select(User.id)
+        .join(_search_index, _search_index.c.rowid == User.id)
+        .where(literal_column("user_search").match(match))
+        .order_by(_tier(query), _search_index.c.rank)
+        .limit(limit)
+    )
+    if exclude:
+        stmt = stmt.where(User.id.not_in(exclude))
+    return list(session.exec(stmt).all())
+
+
+def search_users(session: Session, query: str, limit: int) -> list[User]:
+    """Substring matches first, then typo-tolerant trigram-overlap matches.
+
+    Queries shorter than a trigram (initials, jersey numbers) use a prefix
+    LIKE instead; so does any database without the FTS5 trigram index.
+    """
+    query = query.strip().lower()
+    if not query:
+        return []
+    if len(query) < MIN_TRIGRAM_QUERY or search_backend(session) != FTS_BACKEND:
+        return _like_search(session, query, limit)
+
+    ids = _fts_ids(session, _fts_phrase(query), query, limit, [])
+    if len(ids) < limit:
+        # Fuzzy hits always trail substring hits.
+        trigrams = dict.fromkeys(query[i : i + 3] for i in range(len(query) - 2))
+        fuzzy = " OR ".join(_fts_phrase(trigram) for trigram in trigrams)
+        ids += _fts_ids(session, fuzzy, query, limit - len(ids), ids)
+    if not ids:
+        return []
+
+    users = {user.id: user for user in session.exec(select(User).where(User.id.in_(ids))).all()}
+    return [users[user_id] for user_id in ids if user_id in users]
@@ -0,0 +1,171 @@
+import hashlib
+import logging
+from contextlib import contextmanager
+
+from sqlalchemy import inspect, insert, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlmodel import Session, SQLModel, select
+
+from .config import get_settings
+from .models import SchemaVersion, SyncCounter
+from .search import SEARCH_INDEX_VERSION
+from .seed import seed
+from .sync import SYNCED_ENTITIES
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows development machines
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def schema_fingerprint() -> str:
+    """Hash of the declared tables, columns and search index; changes whenever they do."""
+    digest = hashlib.sha256()
+    for table in sorted(SQLModel.metadata.tables.values(), key=lambda t: t.name):
+        digest.update(table.name.encode())
+        for column in table.columns:
+            digest.update(f"|{column.name}:{type(column.type).__name__}:{column.nullable}".encode())
+    digest.update(SEARCH_INDEX_VERSION.encode())
+    return digest.hexdigest()[:16]
+
+
+def stored_fingerprint(engine: Engine) -> str | None:
+    try:
+        with Session(engine) as session:
+            version = session.get(SchemaVersion, 1)
+    except (OperationalError, ProgrammingError):
+        return None
+    return version.fingerprint if version else None
+
+
+class SchemaMismatchError(RuntimeError):
+    pass
+
+
+def schema_drift(engine: Engine) -> list[str]:
+    """Differences between the reflected database columns and the declared models."""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    drift = []
+    for table in SQLModel.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            drift.append(f"missing table {table.name}")
+            continue
+        reflected = {column["name"] for column in inspector.get_columns(table.name)}
+        declared = set(table.columns.keys())
+        drift += [f"missing column {table.name}.{name}" for name in sorted(declared - reflected)]
+        drift += [f"unexpected column {table.name}.{name}" for name in sorted(reflected - declared)]
+    return drift
+
+
+def verify_schema(engine: Engine) -> None:
+    drift = schema_drift(engine)
+    if drift:
+        raise SchemaMismatchError("Database schema does not match the models: " + "; ".join(drift))
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """Additive changes create_all cannot apply to tables that already exist."""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    with engine.begin() as connection:
+        quote = connection.dialect.identifier_preparer.quote
+        counter = connection.execute(select(SyncCounter.value).where(SyncCounter.id == 1)).first()
+        revision = counter.value if counter is not None else 0
+        for model in SYNCED_ENTITIES.values():
+            table = model.__table__
+            if table.name not in existing_tables:
+                continue
+            if "revision" not in {column["name"] for column in inspector.get_columns(table.name)}:
+                logger.info("Adding %s.revision", table.name)
+                connection.execute(
+                    text(f"ALTER TABLE {quote(table.name)} ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+                )
+                # Rows written before the change feed existed must still show up in a
+                # sync from 0. One revision per row (offset by id) keeps /sync's limit
+                # meaningful; a single shared revision would be one unbounded page.
+                connection.execute(
+                    text(f"UPDATE {quote(table.name)} SET revision = id + :base"), {"base": revision}
+                )
+                revision += connection.execute(text(f"SELECT coalesce(max(id), 0) FROM {quote(table.name)}")).scalar()
+        if counter is None and revision:
+            connection.execute(insert(SyncCounter).values(id=1, value=revision))
+        elif counter is not None and revision > counter.value:
+            connection.execute(update(SyncCounter).where(SyncCounter.id == 1).values(value=revision))
+        for table in SQLModel.metadata.sorted_tables:
+            if table.name in existing_tables:
+                for index in table.indexes:
+                    index.create(connection, checkfirst=True)
+
+
+def migrate(engine: Engine) -> None:
+    """Bring the database up to the declared models or raise SchemaMismatchError."""
+    SQLModel.metadata.create_all(engine)
+    upgrade_schema(engine)
+    # create_all never alters existing tables; refuse to stamp a version the
+    # database does not actually have.
+    verify_schema(engine)
+
+
+def stamp_schema(session: Session, fingerprint: str) -> None:
+    version = session.get(SchemaVersion, 1) or SchemaVersion(id=1, fingerprint=fingerprint)
+    version.fingerprint = fingerprint
+    session.add(version)
+
+
+@contextmanager
+def init_lock(path: str):
+    """Exclusive file lock shared by all workers on this host."""
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def initialize(engine: Engine) -> bool:
+    """Create the schema (and demo data outside production) once across workers.
+
+    Returns True if this process did the work, False if the stored schema
+    version already matched and startup could skip straight to serving.
+    """
+    settings = get_settings()
+    fingerprint = schema_fingerprint()
+    if stored_fingerprint(engine) == fingerprint:
+        return False
+
+    with init_lock(settings.init_lock_path):
+        # Another worker may have finished while we waited for the lock.
+        if stored_fingerprint(engine) == fingerprint:
+            return False
+        logger.info("Initializing database schema %s", fingerprint)
+        migrate(engine)
+        with Session(engine) as session:
+            if settings.seed_on_startup:
+                seed(session)
+            stamp_schema(session, fingerprint)
+            session.commit()
+    return True
+
+
+def ensure_schema(engine: Engine, lock_path: str) -> bool:
+    """Upgrade an existing database (e.g. a club file) without seeding it."""
+    fingerprint = schema_fingerprint()
+    if stored_fingerprint(engine) == fingerprint:
+        return False
+    with init_lock(lock_path):
+        if stored_fingerprint(engine) == fingerprint:
+            return False
+        logger.info("Upgrading database schema to %s", fingerprint)
+        migrate(engine)
+        with Session(engine) as session:
+            stamp_schema(session, fingerprint)
+            session.commit()
+    return True
@@ -0,0 +1,47 @@
+from sqlalchemy import event, insert, update
+from sqlmodel import Session, SQLModel, select
+
+from .models import Drink, Event, EventResponse, LedgerEntry, SyncCounter, Tombstone, User
+
+SYNCED_ENTITIES: dict[str, type[SQLModel]] = {
+    "users": User,
+    "events": Event,
+    "event_responses": EventResponse,
+    "drinks": Drink,
+    "ledger": LedgerEntry,
+}
+_ENTITY_NAMES = {model: name for name, model in SYNCED_ENTITIES.items()}
+
+
+def next_revision(session: Session) -> int:
+    """Allocate the next global revision.
+
+    The UPDATE holds the counter row's write lock until the transaction ends,
+    so revisions become visible in the order they were handed out and a client
+    syncing from `since` can never skip a slower, still-open transaction.
+    """
+    connection = session.connection()
+    bumped = connection.execute(
+        update(SyncCounter).where(SyncCounter.id == 1).values(value=SyncCounter.value + 1)
+    )
+    if bumped.rowcount == 0:
+        connection.execute(insert(SyncCounter).values(id=1, value=1))
+    return connection.execute(select(SyncCounter.value).where(SyncCounter.id == 1)).scalar_one()
+
+
+@event.listens_for(Session, "before_flush")
+def stamp_revisions(session: Session, flush_context, instances) -> None:
+    revision = None
+    for obj in list(session.new) + list(session.dirty):
+        if type(obj) in _ENTITY_NAMES and (obj in session.new or session.is_modified(obj)):
+            revision = revision or next_revision(session)
+            obj.revision = revision
+    for obj in list(session.deleted):
+        name = _ENTITY_NAMES.get(type(obj))
+        if name is not None:
+            revision = revision or next_revision(session)
+            session.add(Tombstone(entity=name, row_id=obj.id, revision=revision))
+
+
+def current_revision(session: Session) -> int:
+    return session.exec(select(SyncCounter.value).where(SyncCounter.id == 1)).first() or 0
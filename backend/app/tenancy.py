@@ -0,0 +1,202 @@
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel, create_engine
+
+from .config import get_settings
+from .group_commit import discard_committer
+from .metrics import instrument_engine, metrics
+from .models import ClubSettings, SchemaVersion
+from .startup import ensure_schema, init_lock, schema_fingerprint
+
+CLUB_SLUG = re.compile(r"[a-z0-9][a-z0-9-]{0,62}")
+
+
+def validate_club(club: str) -> str:
+    club = club.strip().lower()
+    if not CLUB_SLUG.fullmatch(club):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid club identifier")
+    return club
+
+
+def resolve_club(request: Request) -> str:
+    """Club from the tenant header, falling back to the subdomain of the base domain."""
+    settings = get_settings()
+    club = request.headers.get(settings.tenant_header)
+    if not club and settings.tenant_base_domain:
+        host = request.headers.get("host", "").split(":")[0].lower()
+        suffix = "." + settings.tenant_base_domain.lower()
+        if host.endswith(suffix):
+            club = host[: -len(suffix)]
+    if not club:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Club could not be determined")
+    return validate_club(club)
+
+
+def owner_node(club: str, nodes: list[str]) -> str:
+    """Rendezvous hashing: stable per club, and only ~1/N clubs move when a node is added."""
+    return max(nodes, key=lambda node: hashlib.blake2b(f"{node}/{club}".encode(), digest_size=8).digest())
+
+
+def club_database_path(club: str) -> Path:
+    return Path(get_settings().tenant_database_dir) / f"{club}.db"
+
+
+def _create_sqlite_engine(path: Path) -> Engine:
+    return create_engine(f"sqlite:///{path}", echo=False, connect_args={"check_same_thread": False})
+
+
+def _schema_template() -> Path:
+    """Empty, schema-stamped database that new clubs are copied from."""
+    fingerprint = schema_fingerprint()
+    directory = Path(get_settings().tenant_database_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    template = directory / f".template-{fingerprint}.db"
+    if template.exists():
+        return template
+    with init_lock(str(directory / ".template.lock")):
+        if not template.exists():
+            staging = template.with_suffix(".tmp")
+            engine = _create_sqlite_engine(staging)
+            SQLModel.metadata.create_all(engine)
+            with Session(engine) as session:
+                session.add(SchemaVersion(id=1, fingerprint=fingerprint))
+                session.commit()
+            engine.dispose()
+            os.replace(staging, template)
+    return template
+
+
+def provision_club(club: str, club_name: str | None = None) -> Path:
+    """Create a club database by copying the schema template; a file copy plus one insert."""
+    club = validate_club(club)
+    path = club_database_path(club)
+    if path.exists():
+        return path
+    staging = path.with_suffix(".tmp")
+    shutil.copyfile(_schema_template(), staging)
+    engine = _create_sqlite_engine(staging)
+    with Session(engine) as session:
+        session.add(ClubSettings(club_name=club_name or club))
+        session.commit()
+    engine.dispose()
+    os.replace(staging, path)
+    return path
+
+
+class EngineRegistry:
+    """Bounded LRU of per-club engines; evicted engines release their connections.
+
+    The registry lock only guards the LRU itself. Opening (and possibly
+    upgrading) a club database happens under that club's own lock, so a slow
+    open never stalls requests for other clubs.
+    """
+
+    def __init__(self, max_engines: int) -> None:
+        self.max_engines = max_engines
+        self._engines: OrderedDict[str, Engine] = OrderedDict()
+        self._opening: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+    def __contains__(self, club: str) -> bool:
+        return club in self._engines
+
+    def _cached(self, club: str) -> Engine | None:
+        engine = self._engines.get(club)
+        if engine is not None:
+            self._engines.move_to_end(club)
+        return engine
+
+    def get(self, club: str) -> Engine:
+        with self._lock:
+            engine = self._cached(club)
+            if engine is not None:
+                return engine
+            club_lock = self._opening.setdefault(club, threading.Lock())
+        with club_lock:
+            try:
+                with self._lock:
+                    engine = self._cached(club)
+                if engine is None:
+                    engine = self._open(club)
+                    with self._lock:
+                        engine, evicted = self._insert(club, engine)
+                    for evicted_engine in evicted:
+                        discard_committer(evicted_engine)
+                        evicted_engine.dispose()
+            finally:
+                with self._lock:
+                    if self._opening.get(club) is club_lock:
+                        del self._opening[club]
+        return engine
+
+    def _open(self, club: str) -> Engine:
+        path = club_database_path(club)
+        if not path.exists():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Club not found")
+        engine = _create_sqlite_engine(path)
+        # Club files may predate the current models; upgrade them on first open.
+        ensure_schema(engine, str(path.with_suffix(".lock")))
+        return engine
+
+    def _insert(self, club: str, engine: Engine) -> tuple[Engine, list[Engine]]:
+        """Add an opened engine (caller holds the registry lock); returns it and the evicted engines."""
+        existing = self._cached(club)
+        if existing is not None:
+            # Opened concurrently after a failed or evicted open; keep the cached one.
+            return existing, [engine]
+        instrument_engine(engine, f"club:{club}")
+        self._engines[club] = engine
+        evicted = []
+        while len(self._engines) > self.max_engines:
+            name, evicted_engine = self._engines.popitem(last=False)
+            metrics.unregister_engine(f"club:{name}")
+            evicted.append(evicted_engine)
+        return engine, evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            engines = list(self._engines.items())
+            self._engines.clear()
+            for club, _ in engines:
+                metrics.unregister_engine(f"club:{club}")
+        for _, engine in engines:
+            discard_committer(engine)
+            engine.dispose()
+
+
+registry = EngineRegistry(get_settings().tenant_max_engines)
+
+
+def tenant_engine(request: Request) -> Engine:
+    settings = get_settings()
+    club = resolve_club(request)
+    nodes = settings.cluster_node_list
+    if nodes:
+        owner = owner_node(club, nodes)
+        if owner != settings.node_id:
+            raise HTTPException(status_code=status.HTTP_421_MISDIRECTED_REQUEST, detail=f"Club is served by {owner}")
+    return registry.get(club)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Provision a club database.")
+    parser.add_argument("club")
+    parser.add_argument("--name", default=None)
+    args = parser.parse_args()
+    print(provision_club(args.club, args.name))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.pool import StaticPool
+
+from backend.app.database import get_default_engine
+from backend.app.main import create_app
+from backend.app.metrics import listen_for_queries
+from backend.app.seed import seed
+
+
+def _memory_engine(connection: sqlite3.Connection) -> Engine:
+    return create_engine("sqlite://", creator=lambda: connection, poolclass=StaticPool)
+
+
+@pytest.fixture(scope="session")
+def template_db() -> sqlite3.Connection:
+    """Schema plus seed data, built once per test process (i.e. per xdist worker)."""
+    connection = sqlite3.connect(":memory:", check_same_thread=False)
+    template = _memory_engine(connection)
+    SQLModel.metadata.create_all(template)
+    with Session(template) as session:
+        seed(session)
+    yield connection
+    connection.close()
+
+
+@pytest.fixture
+def engine(template_db: sqlite3.Connection) -> Engine:
+    """Private page-level copy of the template; cost is independent of how the seed was built."""
+    clone = sqlite3.connect(":memory:", check_same_thread=False)
+    template_db.backup(clone)
+    test_engine = _memory_engine(clone)
+    listen_for_queries(test_engine)
+    yield test_engine
+    test_engine.dispose()
+    clone.close()
+
+
+@pytest.fixture
+def client(engine: Engine) -> TestClient:
+    app = create_app()
+    app.dependency_overrides[get_default_engine] = lambda: engine
+    return TestClient(app)
@@ -1,31 +1,32 @@
+import base64
+import gc
+import json
+import threading
+import warnings
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
-from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.pool import StaticPool
 
-from backend.app import database
-from backend.app.database import get_session
+from backend.app import search, tenancy
+from backend.app.config import get_settings
+from backend.app.database import get_default_engine
+from backend.app.group_commit import GroupCommitter, committer_for
 from backend.app.main import create_app
+from backend.app.metrics import metrics
+from backend.app.models import Drink, DrinkOrder, User
+from backend.app.search import search_users
 from backend.app.seed import seed
+from backend.app.startup import SchemaMismatchError, initialize, stored_fingerprint
+from backend.app.tenancy import owner_node, provision_club, registry
 
 
-def build_client() -> TestClient:
-    test_engine = create_engine("sqlite://", connect_args={"check_same_thread": False})
-    database.engine = test_engine
-    SQLModel.metadata.create_all(test_engine)
-    with Session(test_engine) as session:
-        seed(session)
-
-    app = create_app()
-
-    def get_session_override():
-        with Session(test_engine) as session:
-            yield session
-
-    app.dependency_overrides[get_session] = get_session_override
-    return TestClient(app)
-
-
-def test_event_response_flow():
-    client = build_client()
+def test_event_response_flow(client):
     headers = {"X-User-Id": "3"}  # player
 
     response = client.post("/events/1/respond", params={"response": "accepted"}, headers=headers)
@@ -38,8 +39,7 @@ def test_event_response_flow():
     assert responses[0]["user_id"] == 3
 
 
-def test_assign_fine_updates_balance_and_ledger():
-    client = build_client()
+def test_assign_fine_updates_balance_and_ledger(client):
     headers = {"X-User-Id": "2"}  # treasurer
 
     assignment = {
@@ -57,8 +57,7 @@ def test_assign_fine_updates_balance_and_ledger():
     assert any(entry["category"] == "fine" for entry in entries)
 
 
-def test_drink_booking_reduces_stock():
-    client = build_client()
+def test_drink_booking_reduces_stock(client):
     headers = {"X-User-Id": "3"}
 
     before = client.get("/drinks").json()[0]
@@ -67,3 +66,491 @@ def test_drink_booking_reduces_stock():
 
     after = client.get("/drinks").json()[0]
     assert after["stock"] == before["stock"] - 2
+
+
+def test_metrics_record_route_latency_and_sql(client):
+    labels = ("GET", "/ledger/{user_id}/balance")
+    before = metrics.request_latency.count(labels)
+    statements_before = metrics.sql_statements.total(labels)
+
+    assert client.get("/ledger/3/balance").status_code == 200
+
+    assert metrics.request_latency.count(labels) == before + 1
+    assert metrics.sql_statements.total(labels) > statements_before
+
+    exported = client.get("/metrics")
+    assert exported.status_code == 200
+    assert exported.headers["content-type"].startswith("text/plain")
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/ledger/{user_id}/balance",le="+Inf"}' in exported.text
+    assert "http_requests_in_flight" in exported.text
+    assert "db_pool_checked_out" in exported.text
+
+
+def test_failing_statements_leave_no_timers_on_the_connection(engine):
+    with engine.connect() as connection:
+        for _ in range(5):
+            with pytest.raises(OperationalError):
+                connection.exec_driver_sql("SELECT * FROM no_such_table")
+        assert not connection.info.get("query_started")
+        assert connection.exec_driver_sql("SELECT 1").scalar() == 1
+
+
+def test_slow_queries_are_logged_with_route(client, monkeypatch, caplog):
+    monkeypatch.setattr(get_settings(), "slow_query_ms", 0.0)
+
+    with caplog.at_level("WARNING", logger="backend.app.metrics"):
+        client.get("/drinks")
+
+    assert any("/drinks" in record.getMessage() and "FROM drink" in record.getMessage() for record in caplog.records)
+    assert metrics.slow_queries.get(("/drinks",)) > 0
+
+
+def test_initialize_runs_once_across_workers(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "init_lock_path", str(tmp_path / "init.lock"))
+    monkeypatch.setattr(get_settings(), "environment", "production")
+    file_engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}", connect_args={"check_same_thread": False})
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: initialize(file_engine), range(4)))
+
+    assert results.count(True) == 1
+    assert initialize(file_engine) is False
+    with Session(file_engine) as session:
+        assert session.exec(select(User)).first() is None  # never seeded in production
+
+
+def test_initialize_refuses_to_stamp_a_drifted_schema(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "init_lock_path", str(tmp_path / "init.lock"))
+    file_engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+    with file_engine.begin() as connection:
+        connection.exec_driver_sql('CREATE TABLE "drink" (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL)')
+
+    with pytest.raises(SchemaMismatchError, match="drink.price_cents"):
+        initialize(file_engine)
+    assert stored_fingerprint(file_engine) is None
+
+
+def _drop_revision_columns(target_engine) -> None:
+    """Rewind a database to the tables as they were before the change feed."""
+    with target_engine.begin() as connection:
+        for table in ("user", "event", "eventresponse", "drink", "ledgerentry"):
+            connection.exec_driver_sql(f"DROP INDEX ix_{table}_revision")
+            connection.exec_driver_sql(f'ALTER TABLE "{table}" DROP COLUMN revision')
+        connection.exec_driver_sql("DELETE FROM schemaversion")
+
+
+def test_initialize_upgrades_databases_without_revision_columns(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "init_lock_path", str(tmp_path / "init.lock"))
+    file_engine = create_engine(f"sqlite:///{tmp_path / 'app.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(file_engine)
+    with Session(file_engine) as session:
+        seed(session)
+    _drop_revision_columns(file_engine)
+
+    assert initialize(file_engine) is True
+
+    with Session(file_engine) as session:
+        revisions = [user.revision for user in session.exec(select(User)).all()]
+    assert len(set(revisions)) == 3 and min(revisions) > 0
+    app = create_app()
+    app.dependency_overrides[get_default_engine] = lambda: file_engine
+    client = TestClient(app)
+    assert len(client.get("/sync").json()["changes"]["users"]) == 3
+
+    # Backfilled rows get one revision each, so the first sync is paged too.
+    first = client.get("/sync", params={"limit": 2}).json()
+    assert first["has_more"] is True
+    assert sum(len(rows) for rows in first["changes"].values()) == 2
+    created = client.post("/users", json={"display_name": "Neu"}).json()
+    assert created["revision"] > max(revisions)
+
+
+def test_club_databases_are_upgraded_on_first_open(tmp_path, monkeypatch):
+    client = build_tenant_client(tmp_path, monkeypatch)
+    path = provision_club("alt")
+    old_engine = create_engine(f"sqlite:///{path}")
+    _drop_revision_columns(old_engine)
+    old_engine.dispose()
+
+    created = client.post("/users", json={"display_name": "Neu"}, headers={"X-Club": "alt"})
+    assert created.status_code == 201
+    assert created.json()["revision"] > 0
+
+
+def test_health_endpoints(client):
+    assert client.get("/health/live").json() == {"status": "ok"}
+    assert client.get("/health/ready").status_code == 503
+
+    client.app.state.ready = True
+    assert client.get("/health/ready").json() == {"status": "ready"}
+
+
+def test_fields_projection_returns_requested_columns_only(client):
+    members = client.get("/users", params={"fields": "id,display_name"}).json()
+    assert members[0] == {"id": 1, "display_name": "Admin"}
+    assert all(set(member) == {"id", "display_name"} for member in members)
+
+    resp = client.get("/users", params={"fields": "id,password"})
+    assert resp.status_code == 400
+
+    documented = client.get("/openapi.json").json()["paths"]["/users"]["get"]["responses"]["200"]
+    assert "only the requested columns" in documented["description"]
+
+
+def test_fast_json_path_matches_validated_response(client, monkeypatch):
+    client.post("/fines/assign", json={"fine_id": 1, "user_id": 3}, headers={"X-User-Id": "2"})
+    slow = {path: client.get(path).json() for path in ("/users", "/ledger", "/events", "/drinks")}
+
+    monkeypatch.setattr(get_settings(), "fast_json", True)
+    fast = {path: client.get(path).json() for path in slow}
+
+    assert fast == slow
+
+
+def build_tenant_client(tmp_path, monkeypatch) -> TestClient:
+    monkeypatch.setattr(get_settings(), "tenancy_enabled", True)
+    monkeypatch.setattr(get_settings(), "tenant_database_dir", str(tmp_path))
+    monkeypatch.setattr(get_settings(), "tenant_base_domain", "verein.app")
+    registry.clear()
+    return TestClient(create_app())
+
+
+def test_tenants_are_routed_to_separate_databases(tmp_path, monkeypatch):
+    client = build_tenant_client(tmp_path, monkeypatch)
+    provision_club("fc-nord", "FC Nord")
+    provision_club("sv-sued")
+
+    client.post("/users", json={"display_name": "Nord Spieler"}, headers={"X-Club": "fc-nord"})
+
+    nord = client.get("/users", headers={"X-Club": "fc-nord"}).json()
+    sued = client.get("/users", headers={"host": "sv-sued.verein.app"}).json()
+    assert [user["display_name"] for user in nord] == ["Nord Spieler"]
+    assert sued == []
+    assert client.get("/subscriptions/settings", headers={"X-Club": "fc-nord"}).json()["club_name"] == "FC Nord"
+
+    assert client.get("/users", headers={"X-Club": "unknown"}).status_code == 404
+    assert client.get("/users").status_code == 400
+    assert client.get("/users", headers={"X-Club": "../etc"}).status_code == 400
+
+
+def test_readiness_does_not_touch_the_default_database_with_tenancy(tmp_path, monkeypatch):
+    client = build_tenant_client(tmp_path, monkeypatch)
+    unused = tmp_path / "default.db"
+    client.app.dependency_overrides[get_default_engine] = lambda: create_engine(f"sqlite:///{unused}")
+    client.app.state.ready = True
+
+    assert client.get("/health/ready").json() == {"status": "ready"}
+    assert not unused.exists()
+
+
+def test_engine_registry_evicts_least_recently_used(tmp_path, monkeypatch):
+    client = build_tenant_client(tmp_path, monkeypatch)
+    monkeypatch.setattr(registry, "max_engines", 2)
+    for club in ("a", "b", "c"):
+        provision_club(club)
+
+    for club in ("a", "b", "a", "c"):
+        assert client.get("/drinks", headers={"X-Club": club}).status_code == 200
+
+    assert len(registry) == 2
+    assert "a" in registry and "c" in registry and "b" not in registry
+
+
+def test_slow_club_open_does_not_block_other_clubs(tmp_path, monkeypatch):
+    build_tenant_client(tmp_path, monkeypatch)
+    provision_club("slow")
+    provision_club("fast")
+    opening, release = threading.Event(), threading.Event()
+    ensure_schema = tenancy.ensure_schema
+
+    def slow_ensure_schema(engine, lock_path):
+        if lock_path.endswith("slow.lock"):
+            opening.set()
+            release.wait(5)
+        return ensure_schema(engine, lock_path)
+
+    monkeypatch.setattr(tenancy, "ensure_schema", slow_ensure_schema)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        slow = pool.submit(registry.get, "slow")
+        assert opening.wait(5)
+        assert registry.get("fast") is registry.get("fast")
+        assert "slow" not in registry
+        release.set()
+        assert slow.result() is registry.get("slow")
+
+
+def test_clubs_are_pinned_to_nodes_by_stable_hash(tmp_path, monkeypatch):
+    nodes = ["node-1", "node-2", "node-3"]
+    placement = {f"club-{i}": owner_node(f"club-{i}", nodes) for i in range(300)}
+    assert placement == {club: owner_node(club, list(reversed(nodes))) for club in placement}
+    assert set(placement.values()) == set(nodes)
+    grown = {club: owner_node(club, nodes + ["node-4"]) for club in placement}
+    assert all(grown[club] in (placement[club], "node-4") for club in placement)
+
+    client = build_tenant_client(tmp_path, monkeypatch)
+    provision_club("club-1")
+    monkeypatch.setattr(get_settings(), "cluster_nodes", ",".join(nodes))
+    monkeypatch.setattr(get_settings(), "node_id", placement["club-1"])
+    assert client.get("/drinks", headers={"X-Club": "club-1"}).status_code == 200
+    other = next(node for node in nodes if node != placement["club-1"])
+    monkeypatch.setattr(get_settings(), "node_id", other)
+    assert client.get("/drinks", headers={"X-Club": "club-1"}).status_code == 421
+
+
+def test_sync_returns_only_changes_since_revision(client):
+    initial = client.get("/sync").json()
+    assert {"users", "events", "drinks"} <= set(initial["changes"])
+    assert initial["has_more"] is False
+    since = initial["revision"]
+
+    assert client.get("/sync", params={"since": since}).json() == {"revision": since, "has_more": False}
+
+    client.post("/drinks/1/book", headers={"X-User-Id": "3"})
+    client.post("/users/assign-role/3", params={"role": "treasurer"}, headers={"X-User-Id": "1"})
+    client.post("/events/1/respond", params={"response": "declined"}, headers={"X-User-Id": "3"})
+
+    delta = client.get("/sync", params={"since": since}).json()
+    assert [drink["id"] for drink in delta["changes"]["drinks"]] == [1]
+    assert delta["changes"]["drinks"][0]["stock"] == 49
+    assert [user["role"] for user in delta["changes"]["users"]] == ["treasurer"]
+    assert delta["changes"]["event_responses"][0]["response"] == "declined"
+    assert "events" not in delta["changes"]
+
+
+def test_sync_pages_whole_revisions_and_reports_deletions(client, engine):
+    with Session(engine) as session:
+        session.delete(session.get(Drink, 2))
+        session.commit()
+
+    first = client.get("/sync", params={"limit": 1}).json()
+    # The seed is one transaction, so the page holds all of it despite limit=1.
+    assert len(first["changes"]["users"]) == 3
+    assert first["has_more"] is True
+
+    second = client.get("/sync", params={"since": first["revision"], "limit": 1}).json()
+    assert second["deleted"] == {"drinks": [2]}
+    assert second["has_more"] is False
+
+
+def test_statement_pages_with_running_balance(client):
+    headers = {"X-User-Id": "2"}
+    amounts = [("credit", 1000), ("debit", 300), ("debit", 250), ("credit", 50), ("debit", 700)]
+    for entry_type, amount in amounts:
+        client.post(
+            "/ledger",
+            json={"user_id": 3, "amount_cents": amount, "entry_type": entry_type, "category": "manual"},
+            headers=headers,
+        )
+    other_member = {"user_id": 1, "amount_cents": 99, "entry_type": "credit", "category": "manual"}
+    client.post("/ledger", json=other_member, headers=headers)
+
+    entries, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/ledger/3/statement", params=params).json()
+        assert len(page["entries"]) <= 2
+        entries += page["entries"]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert page["balance_cents"] == -200
+    assert [entry["amount_cents"] for entry in entries] == [700, 50, 250, 300, 1000]
+    assert [entry["balance_after_cents"] for entry in entries] == [-200, 500, 450, 700, 1000]
+    assert client.get("/ledger/3/statement", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_statement_rejects_tampered_cursors(client):
+    for amount in (100, 200, 300):
+        entry = {"user_id": 3, "amount_cents": amount, "entry_type": "credit", "category": "manual"}
+        client.post("/ledger", json=entry, headers={"X-User-Id": "2"})
+    cursor = client.get("/ledger/3/statement", params={"limit": 1}).json()["next_cursor"]
+    encoded, signature = cursor.split(".")
+    created_at, entry_id, _ = json.loads(base64.urlsafe_b64decode(encoded))
+    forged = base64.urlsafe_b64encode(json.dumps([created_at, entry_id, 10**9]).encode()).decode()
+
+    assert client.get("/ledger/3/statement", params={"cursor": cursor}).status_code == 200
+    assert client.get("/ledger/3/statement", params={"cursor": f"{forged}.{signature}"}).status_code == 400
+    # A cursor is only valid for the member it was issued for.
+    assert client.get("/ledger/1/statement", params={"cursor": cursor}).status_code == 400
+
+
+def test_member_search_prefix_fuzzy_and_index_sync(client, engine):
+    for name, email, number in [
+        ("Maximilian Berger", "max.berger@example.com", "10"),
+        ("Anna Schmidt", "anna@example.com", "7"),
+        ("Jonas Maier", None, "99"),
+    ]:
+        client.post("/users", json={"display_name": name, "email": email, "player_number": number})
+
+    def names(q: str) -> list[str]:
+        return [user["display_name"] for user in client.get("/users/search", params={"q": q}).json()]
+
+    assert set(names("max")[:2]) == {"Max Mustermann", "Maximilian Berger"}
+    assert names("Mustremann")[0] == "Max Mustermann"
+    assert names("anna@exa")[0] == "Anna Schmidt"
+    assert names("99") == ["Jonas Maier"]
+    assert len(client.get("/users/search", params={"q": "a", "limit": 2}).json()) == 2
+
+    with Session(engine) as session:
+        anna = session.get(User, 5)
+        anna.display_name = "Anna Vogel"
+        session.add(anna)
+        session.commit()
+    assert names("vogel")[0] == "Anna Vogel"
+    assert "Anna Schmidt" not in names("schmidt")
+
+
+def test_group_commit_batches_and_isolates_failures(tmp_path, monkeypatch):
+    file_engine = create_engine(f"sqlite:///{tmp_path / 'gc.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(file_engine)
+    with Session(file_engine) as session:
+        seed(session)
+
+    committer = GroupCommitter(file_engine, max_batch=16, window_ms=20)
+    batch_sizes = []
+    apply = committer._apply
+    monkeypatch.setattr(committer, "_apply", lambda batch: (batch_sizes.append(len(batch)), apply(batch)))
+
+    def book(db: Session) -> DrinkOrder:
+        drink = db.get(Drink, 2)
+        if drink.stock < 4:
+            raise HTTPException(status_code=400, detail="Not enough stock")
+        drink.stock -= 4
+        order = DrinkOrder(drink_id=2, user_id=3, quantity=4)
+        db.add_all([drink, order])
+        return order
+
+    def attempt(_):
+        try:
+            return committer.submit(book).id
+        except HTTPException:
+            return None
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        results = list(pool.map(attempt, range(10)))
+
+    booked = [order_id for order_id in results if order_id is not None]
+    assert len(booked) == 7 and len(set(booked)) == 7  # 30 in stock, 4 per booking
+    assert max(batch_sizes) > 1
+    with Session(file_engine) as session:
+        assert session.get(Drink, 2).stock == 2
+        assert len(session.exec(select(DrinkOrder)).all()) == 7
+
+
+def test_group_commit_endpoint_path(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "group_commit_enabled", True)
+
+    resp = client.post("/drinks/1/book", params={"quantity": 2}, headers={"X-User-Id": "3"})
+    assert resp.status_code == 201
+    assert resp.json()["id"] == 1
+    assert client.post("/drinks/1/book", params={"quantity": 999}, headers={"X-User-Id": "3"}).status_code == 400
+    responded = client.post("/events/1/respond", params={"response": "accepted"}, headers={"X-User-Id": "3"})
+    assert responded.status_code == 200
+    assert client.get("/drinks").json()[0]["stock"] == 48
+
+
+def test_group_commit_returns_stored_rows_and_counts_their_sql(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "group_commit_enabled", True)
+    labels = ("POST", "/drinks/{drink_id}/book")
+    before = metrics.sql_statements.total(labels)
+
+    assert client.post("/drinks/1/book", headers={"X-User-Id": "3"}).status_code == 201
+    # The writer's SELECT, UPDATE and INSERT count towards the request, not only the auth lookup.
+    assert metrics.sql_statements.total(labels) - before >= 5
+
+    entry = {"user_id": 3, "amount_cents": 100, "entry_type": "credit", "category": "manual"}
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", UserWarning)
+        created = client.post("/ledger", json=entry, headers={"X-User-Id": "2"})
+    assert created.status_code == 201
+    assert created.json()["revision"] > 0
+
+
+def test_short_member_search_ranks_before_limiting(engine):
+    with Session(engine) as session:
+        session.add_all([User(display_name=f"Zed {number}", player_number=str(number)) for number in range(100, 130)])
+        session.add(User(display_name="Zoe Exact", player_number="10"))
+        session.commit()
+
+        results = search_users(session, "10", 5)
+
+    assert results[0].display_name == "Zoe Exact"
+    assert [user.display_name for user in results[1:]] == ["Zed 100", "Zed 101", "Zed 102", "Zed 103"]
+
+
+def test_trigram_member_search_ranks_before_limiting(engine):
+    with Session(engine) as session:
+        session.add_all([User(display_name=f"Johann Hannemann {number}") for number in range(50)])
+        session.add(User(display_name="Anna"))
+        session.commit()
+
+        results = search_users(session, "ann", 5)
+
+    assert results[0].display_name == "Anna"
+    assert len(results) == 5
+
+
+def test_member_search_falls_back_without_trigram_tokenizer(monkeypatch):
+    monkeypatch.setattr(search, "_FTS_TABLE_DDL", search._FTS_TABLE_DDL.replace("'trigram'", "'no_such_tokenizer'"))
+    plain_engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(plain_engine)
+
+    with Session(plain_engine) as session:
+        seed(session)
+        assert search.search_backend(session) == search.LIKE_BACKEND
+        assert [user.display_name for user in search_users(session, "must", 5)] == ["Max Mustermann"]
+
+
+def test_group_committer_does_not_pin_its_engine(tmp_path):
+    short_lived = create_engine(f"sqlite:///{tmp_path / 'gone.db'}")
+    committer = committer_for(short_lived)
+    engine_ref = weakref.ref(short_lived)
+
+    del short_lived
+    gc.collect()
+
+    assert engine_ref() is None
+    assert committer.engine is None
+
+
+def test_evicting_a_club_stops_its_group_committer(tmp_path, monkeypatch):
+    build_tenant_client(tmp_path, monkeypatch)
+    monkeypatch.setattr(registry, "max_engines", 1)
+    provision_club("a")
+    provision_club("b")
+
+    committer = committer_for(registry.get("a"))
+    committer.submit(lambda db: db.add(Drink(name="Wasser")))
+    writer = committer._thread
+    assert writer is not None and writer.is_alive()
+
+    registry.get("b")  # evicts "a"
+
+    writer.join(timeout=5)
+    assert not writer.is_alive()
+    assert committer._thread is None
+
+
+def test_group_commit_survives_base_exceptions(tmp_path):
+    file_engine = create_engine(f"sqlite:///{tmp_path / 'gc.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(file_engine)
+    committer = GroupCommitter(file_engine, max_batch=16, window_ms=0)
+
+    def explode(db: Session):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        committer.submit(explode)
+
+    def add_drink(db: Session) -> Drink:
+        drink = Drink(name="Wasser")
+        db.add(drink)
+        return drink
+
+    assert committer.submit(add_drink).id == 1
+
+
+def test_test_engines_stay_out_of_the_global_metrics_registry(client, engine):
+    client.get("/drinks")
+    assert engine not in metrics._engines.values()
@@ -0,0 +1,62 @@
+"""Cold-start timing: fresh process -> app built -> lifespan startup finished.
+
+Each sample runs in its own interpreter so import cost is included, which is
+what a newly spawned uvicorn worker pays. The first boot against an empty
+database initializes the schema; later boots should hit the version fast path.
+
+    python benchmarks/cold_start.py [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+WORKER = """
+import asyncio, time
+started = time.perf_counter()
+from backend.app.main import create_app
+app = create_app()
+
+async def boot():
+    async with app.router.lifespan_context(app):
+        pass
+
+asyncio.run(boot())
+print(time.perf_counter() - started)
+"""
+
+
+def boot_once(env: dict[str, str]) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", WORKER], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "VEREIN_DATABASE_URL": f"sqlite:///{tmp}/bench.db",
+            "VEREIN_INIT_LOCK_PATH": f"{tmp}/bench.lock",
+            "VEREIN_ENVIRONMENT": "production",
+        }
+        first = boot_once(env)
+        warm = [boot_once(env) for _ in range(args.runs)]
+
+    print(f"first boot (schema init):  {first * 1000:8.1f} ms")
+    print(f"warm boot median (n={args.runs}): {statistics.median(warm) * 1000:8.1f} ms")
+    print(f"warm boot max:             {max(warm) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
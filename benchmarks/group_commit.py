@@ -0,0 +1,71 @@
+"""Write throughput: commit-per-request vs. group commit on a file-backed SQLite DB.
+
+Each writer thread books drinks (stock update + order insert), the same work
+as POST /drinks/{id}/book, against a fresh database per mode.
+
+    python benchmarks/group_commit.py [--writers 32] [--writes 2000] [--window-ms 0]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlmodel import Session, SQLModel, create_engine  # noqa: E402
+
+from backend.app.group_commit import GroupCommitter  # noqa: E402
+from backend.app.models import Drink, DrinkOrder, User  # noqa: E402
+
+
+def book(db: Session) -> DrinkOrder:
+    drink = db.get(Drink, 1)
+    drink.stock -= 1
+    order = DrinkOrder(drink_id=1, user_id=1)
+    db.add_all([drink, order])
+    return order
+
+
+def fresh_engine(directory: str, name: str):
+    engine = create_engine(f"sqlite:///{directory}/{name}.db", connect_args={"check_same_thread": False, "timeout": 30})
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all([User(display_name="Bench"), Drink(name="Wasser", stock=10**9)])
+        session.commit()
+    return engine
+
+
+def measure(label: str, write, writers: int, writes: int) -> None:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=writers) as pool:
+        list(pool.map(lambda _: write(), range(writes)))
+    elapsed = time.perf_counter() - started
+    print(f"{label:<22} {writes / elapsed:9.0f} writes/s  ({elapsed * 1000:.0f} ms)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=32)
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--window-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = fresh_engine(tmp, "per_request")
+
+        def commit_per_request() -> None:
+            with Session(engine) as session:
+                book(session)
+                session.commit()
+
+        measure("commit per request", commit_per_request, args.writers, args.writes)
+
+        committer = GroupCommitter(fresh_engine(tmp, "grouped"), args.batch, args.window_ms)
+        measure("group commit", lambda: committer.submit(book), args.writers, args.writes)
+
+
+if __name__ == "__main__":
+    main()